@@ -1,145 +1,195 @@
-import json
-import xml.etree.ElementTree as ET
-from typing import Any
-from xml.dom import minidom
+"""
+解析设计令牌JSON文件，生成Android颜色、语义颜色和渐变占位的XML资源文件
 
+性能说明：本模块的开销集中在JSON解析、字符串处理和XML输出上，没有数值计算，
+不要引入Numba/@njit（numba.typed.Dict 在这类字符串键场景下比CPython原生dict更慢，
+参见 numba/numba#6439、#4743、#9374）。优化请优先考虑：orjson加载、
+一次性展开primitive查找表、以及直接逐行写出XML。
+"""
 
-def parse_design_tokens(json_file_path):
-    # 读取JSON文件
-    with open(json_file_path, 'r', encoding='utf-8') as file:
-        data = json.load(file)
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
 
-    return data
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+# 调试输出开关，开启后打印语义颜色遍历过程
+VERBOSE = False
 
-def getValue(design_tokens: object, color_item_key: str) -> str:
-    key_arrays = color_item_key.split(".")
-    m = design_tokens
-    for idx, item in enumerate(key_arrays):
-        m = m.get(item, {})
-    return m.get('value')
 
+def parse_design_tokens(json_file_path):
+    # 读取JSON文件，优先使用orjson（需要bytes输入），不可用时回退到标准库json
+    # 两者都会复用重复出现的键对象，代码里的 'value'/'type' 等字面量本身已被驻留，无需再sys.intern
+    if orjson is not None:
+        with open(json_file_path, 'rb') as file:
+            data = orjson.loads(file.read())
+    else:
+        with open(json_file_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
 
-def generate_android_colors_xml(design_tokens, output_file_path):
-    # 创建XML根元素
-    root = ET.Element("resources")
+    return data
 
-    # 解析primitives中的颜色
-    primitives = design_tokens.get('primitives', {})
-    colors = primitives.get('colors', {})
+
+# resources文件固定的头尾
+_XML_HEADER = '<?xml version="1.0" encoding="utf-8"?>\n<resources>\n'
+_XML_FOOTER = '</resources>\n'
+# 输出文件的写缓冲区大小
+_WRITE_BUFFER_SIZE = 1 << 20
+# 属性值中额外需要转义的字符
+_ATTR_ENTITIES = {'"': '&quot;'}
+# 语义颜色名中的短横线替换为下划线
+_DASH_TO_US = str.maketrans("-", "_")
+# 语义颜色对primitives的引用，如 {primitives.light mode.colors.brand.600}
+_REF_RE = re.compile(r'^\{primitives\.(?:light mode\.)?(.+)\}$')
+
+
+def _color_line(name, value):
+    # 拼接单个color元素，值缺失时输出空元素
+    name = escape(name, _ATTR_ENTITIES)
+    if value is None:
+        return f'    <color name="{name}" />\n'
+    return f'    <color name="{name}">{escape(value)}</color>\n'
+
+
+def _write_xml(lines, output_file_path):
+    # 边生成边写出，不在内存中拼出整个文档
+    with open(output_file_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as xml_file:
+        xml_file.write(_XML_HEADER.encode('utf-8'))
+        xml_file.writelines(map(str.encode, lines))
+        xml_file.write(_XML_FOOTER.encode('utf-8'))
+
+
+def _flatten(prefix, node, out):
+    # 先序遍历一次，把颜色叶子节点按点号路径展开成 路径 -> 颜色值 的扁平表
+    for key, child in node.items():
+        if type(child) is dict:
+            prefix.append(key)
+            if child.get('type') == 'color' and 'value' in child:
+                out['.'.join(prefix)] = child['value']
+            else:
+                _flatten(prefix, child, out)
+            prefix.pop()
+    return out
+
+
+def _iter_semantic_leaves(node):
+    # 用显式栈按原有顺序遍历语义颜色树，产出 (节点名, 引用值)，不限层级
+    stack = [iter(node.items())]
+    while stack:
+        for key, child in stack[-1]:
+            # effects部分暂时不处理,不符合颜色json格式,单独处理
+            if type(child) is not dict or key == "effects":
+                continue
+            value = child.get('value')
+            if type(value) is str:
+                yield key, value
+            elif value is not None or type(child.get('type')) is str:
+                # 阴影、字体等非引用令牌不是颜色，也不再向下遍历
+                continue
+            else:
+                stack.append(iter(child.items()))
+                break
+        else:
+            stack.pop()
+
+
+def _extract_base_colors(design_tokens):
+    # 解析primitives中的颜色，得到 (名称, 颜色值) 列表
+    colors = design_tokens.get('primitives', {}).get('colors', {})
+    pairs = []
+    append = pairs.append
     # 遍历所有颜色类别
     for color_category, color_values in colors.items():
-        if isinstance(color_values, dict):
-            # 处理基础颜色（如base、brand、error等）
-            for color_name, color_info in color_values.items():
-                if isinstance(color_info, dict) and 'type' in color_info and color_info['type'] == 'color':
-                    color_value = color_info.get('value', '')
-                    if color_value:
-                        # 创建color元素
-                        color_element = ET.SubElement(root, "color", name=f"{color_category}_{color_name}")
-                        color_element.text = color_value
-
-    # 创建格式化的XML字符串
-    rough_string = ET.tostring(root, 'utf-8')
-    reparsed = minidom.parseString(rough_string)
-    pretty_xml = reparsed.toprettyxml(indent="    ")
-
-    # 写入文件
-    with open(output_file_path, 'w', encoding='utf-8') as xml_file:
-        xml_file.write(pretty_xml)
-
-    print(f"Android colors XML generated: {output_file_path}")
-
-
-def generate_android_colors_with_semantic_names(design_tokens, output_file_path):
-    # 创建XML根元素
-    root = ET.Element("resources")
-
-    # 解析primitives中的颜色
+        # JSON解析只会产生原生dict，用type比较代替isinstance
+        if type(color_values) is not dict:
+            continue
+        # 处理基础颜色（如base、brand、error等）
+        for color_name, color_info in color_values.items():
+            if type(color_info) is dict and color_info.get('type') == 'color':
+                color_value = color_info.get('value', '')
+                if color_value:
+                    append((f"{color_category}_{color_name}", color_value))
+    return pairs
+
+
+def _extract_semantic_colors(design_tokens):
+    # 解析primitives中的颜色，一次展开为 路径(不含primitives前缀) -> 颜色值 的查找表
     primitives = design_tokens.get('primitives', {})
-    colors = primitives.get('colors', {})
+    prim_table = _flatten([], primitives, {})
 
-    # 颜色映射到语义名称
-    # 生成日间模式颜色
+    # 颜色映射到语义名称（日间与夜间模式）
     color_modes = design_tokens.get('1. color modes', {})
-    for day_light_mode,modeAttrs in color_modes.items(): #light -dark
-        # light_mode_colors = day_light_mode.get('colors', {})
-        for k,v in modeAttrs.items(): # colors component-colors
-            for color_module_name, color_values in v.items(): #
-                # effects部分暂时不处理,不符合颜色json格式,单独处理
-                print(f"000-{color_module_name} {color_module_name == 'effects'}")
-                if color_module_name == "effects":
-                    continue
-                # 颜色模块注释
-                ET.Comment(f"{color_module_name}")
-                for color_sub_name, color_sub_attrs in color_values.items():
-                    color_item_name = str.replace(str.split(color_sub_name, " ")[0], "-", "_")
-                    color_key_value = color_sub_attrs.get('value')
-                    print(f"!!!{color_sub_name} --{color_key_value}")
-                    if color_key_value is not None:
-                        print(f"!!!{color_item_name}")
-                        color_item_key = str.replace(color_key_value, "light mode.", "")
-                        color_item_value = getValue(design_tokens, color_item_key[1:-1])
-                        color_element = ET.SubElement(root, "color", name=color_item_name)
-                        color_element.text = color_item_value
-                        # print(f">>>{color_item_name} --{color_key_value}----{color_item_key} --{color_item_value}")
-                    else:
-                        for color_sub_name2,color_sub_attrs2 in color_sub_attrs.items():
-                            color_item_name = str.replace(str.split(color_sub_name2, " ")[0], "-", "_")
-                            color_key_value = color_sub_attrs2.get('value')
-                            if color_key_value is not None:
-                                print(f"!!!{color_item_name}")
-                                color_item_key = str.replace(color_key_value, "light mode.", "")
-                                color_item_value = getValue(design_tokens, color_item_key[1:-1])
-                                color_element = ET.SubElement(root, "color", name=color_item_name)
-                                color_element.text = color_item_value
-                                # print(f">>>{color_item_name} --{color_key_value}----{color_item_key} --{color_item_value}")
-
-
-    # 创建格式化的XML字符串
-    rough_string = ET.tostring(root, 'utf-8')
-    reparsed = minidom.parseString(rough_string)
-    pretty_xml = reparsed.toprettyxml(indent="    ")
-
-    # 写入文件
-    with open(output_file_path, 'w', encoding='utf-8') as xml_file:
-        xml_file.write(pretty_xml)
+    pairs = []
+    # 循环内频繁使用的函数先绑定为局部变量
+    append = pairs.append
+    lookup = prim_table.get
+    ref_match = _REF_RE.match
+    for color_sub_name, color_key_value in _iter_semantic_leaves(color_modes):
+        color_item_name = color_sub_name.split(" ", 1)[0].translate(_DASH_TO_US)
+        if VERBOSE:
+            print(f"!!!{color_sub_name} --{color_key_value}")
+        # 一次匹配去掉花括号、primitives前缀和light mode，非primitives引用视为缺失
+        m = ref_match(color_key_value)
+        append((color_item_name, lookup(m.group(1)) if m else None))
+    return pairs
+
+
+def _extract_gradients(design_tokens):
+    # 解析gradients，得到 (类别_名称, 占位颜色) 列表
+    gradients = design_tokens.get('gradient', {}).get('gradient', {})
+    pairs = []
+    append = pairs.append
+    for gradient_category, gradient_items in gradients.items():
+        if type(gradient_items) is not dict:
+            continue
+        for gradient_name, gradient_info in gradient_items.items():
+            if type(gradient_info) is dict and gradient_info.get('type') == 'custom-gradient':
+                # 这里只是示例，实际Android中渐变需要在drawable XML中定义
+                # 我们可以创建一个占位符颜色引用，默认黑色
+                append((f"{gradient_category}_{gradient_name}", "#FF000000"))
+    return pairs
+
+
+def _extract(design_tokens):
+    # 一次性把令牌树整理成各输出文件需要的 (名称, 值) 列表
+    return {
+        "colors": _extract_base_colors(design_tokens),
+        "semantic": _extract_semantic_colors(design_tokens),
+        "gradients": _extract_gradients(design_tokens),
+    }
+
+
+def _gradient_lines(gradients):
+    # 添加注释
+    yield "    <!-- Gradient definitions - Note: Android doesn't support gradients in colors.xml natively -->\n"
+    color_line = _color_line
+    for gradient_name, color_value in gradients:
+        # 创建gradient注释
+        yield f"    <!-- Gradient: {gradient_name} -->\n"
+        yield color_line(f"gradient_{gradient_name}", color_value)
 
-    print(f"Android colors XML with semantic names generated: {output_file_path}")
 
+def generate_android_colors_xml(colors, output_file_path):
+    # 逐行生成并写入文件
+    _write_xml((_color_line(name, value) for name, value in colors), output_file_path)
 
-def generate_android_gradients(design_tokens, output_file_path):
-    # 创建XML根元素
-    root = ET.Element("resources")
+    print(f"Android colors XML generated: {output_file_path}")
 
-    # 解析gradients
-    gradients = design_tokens.get('gradient', {}).get('gradient', {})
 
-    # 添加注释
-    comment = ET.Comment(" Gradient definitions - Note: Android doesn't support gradients in colors.xml natively ")
-    root.append(comment)
+def generate_android_colors_with_semantic_names(semantic_colors, output_file_path):
+    # 逐行生成并写入文件
+    _write_xml((_color_line(name, value) for name, value in semantic_colors), output_file_path)
 
-    for gradient_category, gradient_items in gradients.items():
-        if isinstance(gradient_items, dict):
-            for gradient_name, gradient_info in gradient_items.items():
-                if isinstance(gradient_info, dict) and gradient_info.get('type') == 'custom-gradient':
-                    # 创建gradient注释
-                    grad_comment = ET.Comment(f" Gradient: {gradient_category}_{gradient_name} ")
-                    root.append(grad_comment)
-
-                    # 这里只是示例，实际Android中渐变需要在drawable XML中定义
-                    # 我们可以创建一个占位符颜色引用
-                    color_element = ET.SubElement(root, "color", name=f"gradient_{gradient_category}_{gradient_name}")
-                    color_element.text = "#FF000000"  # 默认黑色
-
-    # 创建格式化的XML字符串
-    rough_string = ET.tostring(root, 'utf-8')
-    reparsed = minidom.parseString(rough_string)
-    pretty_xml = reparsed.toprettyxml(indent="    ")
-
-    # 写入文件
-    with open(output_file_path, 'w', encoding='utf-8') as xml_file:
-        xml_file.write(pretty_xml)
+    print(f"Android colors XML with semantic names generated: {output_file_path}")
+
+
+def generate_android_gradients(gradients, output_file_path):
+    # 逐行生成并写入文件
+    _write_xml(_gradient_lines(gradients), output_file_path)
 
     print(f"Android gradients XML generated: {output_file_path}")
 
@@ -151,15 +201,22 @@ def main():
     # try:
     # 解析设计令牌
     design_tokens = parse_design_tokens(json_file_path)
-
-    # 生成基础颜色XML
-    generate_android_colors_xml(design_tokens, "colors_base.xml")
-
-    # 生成带语义名称的颜色XML
-    generate_android_colors_with_semantic_names(design_tokens, "colors_semantic.xml")
-
-    # 生成渐变XML（占位符）
-    generate_android_gradients(design_tokens, "gradients.xml")
+    extracted = _extract(design_tokens)
+
+    # 三个文件互不依赖且只读共享数据，并发写出
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            # 生成基础颜色XML
+            executor.submit(generate_android_colors_xml, extracted["colors"], "colors_base.xml"),
+            # 生成带语义名称的颜色XML
+            executor.submit(generate_android_colors_with_semantic_names, extracted["semantic"],
+                            "colors_semantic.xml"),
+            # 生成渐变XML（占位符）
+            executor.submit(generate_android_gradients, extracted["gradients"], "gradients.xml"),
+        ]
+        # 抛出写文件过程中的异常
+        for future in futures:
+            future.result()
 
     print("All XML files generated successfully!")
 
@@ -6,82 +6,111 @@
 import json
 import os
 import re
-from typing import Dict, Any, List, Tuple
+from collections import ChainMap
+from functools import lru_cache
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def load_json_file(file_path: str) -> Dict[str, Any]:
-    """加载JSON文件"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+# 调试输出开关，开启后打印遍历过程中找到的每个渐变
+VERBOSE = False
 
+# 预编译的正则表达式，避免每个节点都走re模块的缓存查找
+# 括号后缀，如 (light mode)、(dark mode)
+_RE_PAREN_SUFFIX = re.compile(r'\s*\([^)]*\)')
 
-def is_color_node(node: Dict[str, Any]) -> bool:
-    """判断是否为颜色节点"""
-    return node.get('type') == 'color' and 'value' in node
+_ASCII_ALNUM_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789')
+_ASCII_ALNUM = frozenset(map(ord, _ASCII_ALNUM_CHARS))
 
 
-def is_light_mode(node_name: str) -> bool:
-    """判断是否为日间模式节点"""
-    return 'light mode' in node_name.lower()
+class _NonAlnumTable(dict):
+    """str.translate用的映射表：ASCII字母数字保持不变，其他字符替换为replacement
 
+    首次遇到的字符在__missing__中计算并缓存，之后都是dict的C层查找
+    """
+
+    def __init__(self, replacement):
+        super().__init__()
+        self.replacement = replacement
+
+    def __missing__(self, codepoint: int):
+        value = codepoint if codepoint in _ASCII_ALNUM else self.replacement
+        self[codepoint] = value
+        return value
 
-def should_include_in_light(node_name: str) -> bool:
-    """判断是否应该包含在日间模式XML中"""
-    return 'light mode' in node_name.lower() or 'light mode' not in node_name.lower()
 
+# 非字母数字字符替换为下划线 / 直接删除
+_XLATE = _NonAlnumTable('_')
+_XDELETE = _NonAlnumTable(None)
 
-def should_include_in_dark(node_name: str) -> bool:
-    """判断是否应该包含在夜间模式XML中"""
-    return 'dark mode' in node_name.lower() or 'light mode' not in node_name.lower()
 
+def load_json_file(file_path: str) -> Dict[str, Any]:
+    """加载JSON文件，优先使用orjson（需要bytes输入），不可用时回退到标准库json
+
+    orjson.JSONDecodeError是json.JSONDecodeError的子类，调用方的异常处理无需改动
+    """
+    if orjson is not None:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
 
-def extract_color_value(value: str) -> str:
-    """提取颜色值，去掉透明度"""
-    if len(value) == 9:  # #RRGGBBAA格式
-        return value[:7]
-    return value
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
 
-def format_xml_name(name_parts: List[str]) -> str:
-    """格式化XML名称，将路径转换为下划线分隔的小写名称"""
-    # 清理名称，移除特殊字符和空格
-    cleaned_parts = []
-    for part in name_parts:
-        # 移除 (light mode), (dark mode) 等后缀
-        part = re.sub(r'\s*\([^)]*\)', '', part)
-        # 替换空格和特殊字符为下划线
-        part = re.sub(r'[^a-zA-Z0-9]', '_', part)
-        # 移除连续的下划线
-        part = re.sub(r'_+', '_', part)
-        # 移除开头和结尾的下划线
-        part = part.strip('_')
-        if part:
-            cleaned_parts.append(part.lower())
+def is_light_mode(node_name: str) -> bool:
+    """判断是否为日间模式节点"""
+    return 'light mode' in node_name.lower()
 
-    # 移除 'colors' 前缀（如果存在）
-    if cleaned_parts and cleaned_parts[0] == 'colors':
-        cleaned_parts = cleaned_parts[1:]
 
-    # 移除 'base' 前缀（如果存在）
-    if cleaned_parts and cleaned_parts[0] == 'base':
-        cleaned_parts = cleaned_parts[1:]
+@lru_cache(maxsize=None)
+def clean_name_segment(part: str) -> str:
+    """清理单个路径片段：移除括号后缀和特殊字符，转成下划线分隔的小写名称，可能返回空字符串
 
-    # 移除 'component colors' 前缀（如果存在）
-    if cleaned_parts and cleaned_parts[0] == 'component':
-        cleaned_parts = cleaned_parts[1:]
-    if len(cleaned_parts) > 1 and cleaned_parts[0] == 'colors':
-        cleaned_parts = cleaned_parts[1:]
+    兄弟节点之间大量重复同样的片段（如 50、100、light mode），结果按片段缓存
+    """
+    # 移除 (light mode), (dark mode) 等后缀，大部分片段没有括号，直接跳过正则
+    if '(' in part:
+        part = _RE_PAREN_SUFFIX.sub('', part)
+
+    # 单次遍历：保留ASCII字母数字，其他连续字符合并成一个下划线，并去掉开头和结尾的下划线
+    out = []
+    prev_underscore = True
+    for c in part:
+        if c in _ASCII_ALNUM_CHARS:
+            out.append(c)
+            prev_underscore = False
+        elif not prev_underscore:
+            out.append('_')
+            prev_underscore = True
+    if out and prev_underscore:
+        out.pop()
+    return ''.join(out).lower()
+
+
+# 生成XML名称时需要移除的路径前缀
+_PREFIX_STRIP = frozenset({'colors', 'base', 'component'})
+
+
+def format_cleaned_xml_name(cleaned_parts: List[str]) -> str:
+    """根据已清理（且不含空片段）的路径生成XML名称，只查看开头的前缀和末尾两个片段"""
+    # 移除开头的 'colors'、'base'、'component colors' 等前缀（如果存在），至少保留最后一个片段，避免生成空名称
+    start = 0
+    size = len(cleaned_parts)
+    while start < size - 1 and cleaned_parts[start] in _PREFIX_STRIP:
+        start += 1
 
     # 只有节点名是纯数字的时候保留父节点的名称
-    if len(cleaned_parts) > 1 and cleaned_parts[-1].isdigit():
-        color_name = f"{cleaned_parts[-2]}_{cleaned_parts[-1]}"
-        return color_name
+    if size - start > 1 and cleaned_parts[-1].isdigit():
+        return f"{cleaned_parts[-2]}_{cleaned_parts[-1]}"
 
     # 否则只使用最后一个节点名
-    if len(cleaned_parts) > 1:
+    if size - start > 1:
         return cleaned_parts[-1]
 
-    return '_'.join(cleaned_parts)
+    return '_'.join(cleaned_parts[start:])
 
 
 def extract_content_between_spacing_and_bracket(input_string: str) -> str:
@@ -108,45 +137,37 @@ def extract_content_between_spacing_and_bracket(input_string: str) -> str:
     if spacing_pos == -1:
         return ""
 
-    # 找到spacing前一个点号的位置
-    # 从spacing位置向前查找点号
-    dot_before_spacing_pos = -1
-    for i in range(spacing_pos - 1, -1, -1):
-        if input_string[i] == '.':
-            dot_before_spacing_pos = i + 1  # 从点号后面一位开始
-            break
-
-    if dot_before_spacing_pos == -1:
+    # 找到spacing前一个点号的位置，从点号后面一位开始
+    dot_pos = input_string.rfind('.', 0, spacing_pos)
+    if dot_pos == -1:
         return ""
+    content_start = dot_pos + 1
 
-    # 提取内容 (从点号后一位到最后一个左括号前)
-    content = input_string[dot_before_spacing_pos:last_bracket_pos].strip()
+    # spacing是第一次出现的位置，所以它在内容中的位置可以直接算出，不必再查找
+    after_start = spacing_pos + len('spacing')
+    # 找到spacing后面的内容（内容整体会去掉首尾空白）
+    after_spacing = input_string[after_start:last_bracket_pos].rstrip()
+    # spacing后面没有内容（或spacing不在括号前），返回点号后一位到最后一个左括号前的内容
+    if not after_spacing:
+        return input_string[content_start:last_bracket_pos].strip()
 
     # 将spacing后面的第一个点号替换成下划线，移除其他点号
-    spacing_index = content.find('spacing')
-    if spacing_index != -1:
-        # 找到spacing后面的内容
-        after_spacing = content[spacing_index + len('spacing'):]
-        # 如果spacing后面有内容
-        if after_spacing:
-            # 找到第一个点号
-            first_dot_pos = after_spacing.find('.')
-            if first_dot_pos != -1:
-                # 将第一个点号替换成下划线，移除其他点号
-                before_first_dot = after_spacing[:first_dot_pos]
-                after_first_dot = after_spacing[first_dot_pos + 1:].replace('.', '')
-                processed_after_spacing = before_first_dot + '_' + after_first_dot
-            else:
-                # 没有点号，保持原样
-                processed_after_spacing = after_spacing
-
-            content = 'spacing' + processed_after_spacing
+    first_dot_pos = after_spacing.find('.')
+    if first_dot_pos != -1:
+        after_spacing = after_spacing[:first_dot_pos] + '_' + after_spacing[first_dot_pos + 1:].replace('.', '')
 
-    return content
+    return 'spacing' + after_spacing
 
 
 def format_spacing_name(name_parts: List[str]) -> str:
     """格式化spacing尺寸名称，采用节点属性+父节点名"""
+    # 名称只取决于最后两个片段，按这两个片段缓存，不同路径下的同名节点可以复用结果
+    return _format_spacing_name_cached(tuple(name_parts[-2:]))
+
+
+@lru_cache(maxsize=None)
+def _format_spacing_name_cached(name_parts: Tuple[str, ...]) -> str:
+    """format_spacing_name的缓存实现"""
     if not name_parts:
         return "unknown"
 
@@ -160,174 +181,230 @@ def format_spacing_name(name_parts: List[str]) -> str:
         node_name = last_part
 
     # 清理节点名，移除特殊字符
-    node_name = re.sub(r'[^a-zA-Z0-9]', '', node_name)
+    node_name = node_name.translate(_XDELETE)
 
     # 如果有父节点，使用父节点名
     if len(name_parts) > 1:
         parent_part = name_parts[-2]
         # 清理父节点名
-        parent_part = re.sub(r'[^a-zA-Z0-9]', '', parent_part)
+        parent_part = parent_part.translate(_XDELETE)
         return f"{parent_part}_{node_name}"
 
     return node_name
 
 
-def is_dimension_node(node: Dict[str, Any]) -> bool:
-    """判断是否为尺寸节点"""
-    return node.get('type') == 'dimension' and 'value' in node
-
-
-def traverse_primitive_colors(data: Dict[str, Any], path: List[str],
-                              light_colors: Dict[str, str],
-                              dark_colors: Dict[str, str]) -> None:
-    """遍历primitives模块中的颜色"""
-    for key, value in data.items():
-        current_path = path + [key]
-
-        if isinstance(value, dict):
-            if is_color_node(value):
-                # 这是一个颜色节点
-                color_value = extract_color_value(value['value'])
-                xml_name = format_xml_name(current_path)
-
-                # 根据路径判断是否包含light/dark mode
-                path_str = ' '.join(current_path).lower()
-
-                # 特殊处理 gray 颜色
-                if 'gray' in path_str:
-                    if 'light mode' in path_str:
-                        light_colors[xml_name] = color_value
-                    elif 'dark mode' in path_str:
-                        dark_colors[xml_name] = color_value
-                    else:
-                        # 如果没有明确指定模式，同时添加到两个集合
-                        light_colors[xml_name] = color_value
-                        dark_colors[xml_name] = color_value
-                else:
-                    # 其他颜色按原来的逻辑处理
-                    if should_include_in_light(path_str):
-                        light_colors[xml_name] = color_value
-
-                    if should_include_in_dark(path_str):
-                        dark_colors[xml_name] = color_value
-            else:
-                # 继续递归
-                traverse_primitive_colors(value, current_path, light_colors, dark_colors)
-
-
-def traverse_spacing_dimensions(data: Dict[str, Any], path: List[str],
-                                dimensions: Dict[str, int]) -> None:
-    """遍历primitives模块中的spacing尺寸"""
-    for key, value in data.items():
-        current_path = path + [key]
-
-        if isinstance(value, dict):
-            if is_dimension_node(value):
-                # 这是一个尺寸节点
-                dimension_value = value['value']
-                xml_name = format_spacing_name(current_path)
-                dimensions[xml_name] = dimension_value
-            else:
-                # 继续递归
-                traverse_spacing_dimensions(value, current_path, dimensions)
+# 路径中的模式标记位
+_LIGHT_MODE = 1
+_DARK_MODE = 2
 
 
-def generate_android_xml(colors: Dict[str, str], output_path: str, file_name: str) -> None:
-    """生成Android XML文件"""
-    xml_content = '<?xml version="1.0" encoding="utf-8"?>\n'
-    xml_content += '<resources>\n'
+@lru_cache(maxsize=None)
+def _mode_flags(key: str) -> int:
+    """单个路径片段包含的模式标记（light mode / dark mode）"""
+    key_lower = key.lower()
+    flags = 0
+    if 'light mode' in key_lower:
+        flags |= _LIGHT_MODE
+    if 'dark mode' in key_lower:
+        flags |= _DARK_MODE
+    return flags
 
-    # 按名称排序
-    for name in sorted(colors.keys()):
-        xml_content += f'    <color name="{name}">{colors[name]}</color>\n'
 
-    xml_content += '</resources>'
+def _iter_leaves(data: Dict[str, Any], path: List[str],
+                 is_leaf: Callable[[Dict[str, Any]], bool],
+                 clean: Optional[Callable[[str], str]] = None
+                 ) -> Iterator[Tuple[List[str], Optional[List[str]], Dict[str, Any], int]]:
+    """用显式栈按先序遍历字典树，产出满足is_leaf的节点、其路径、清理后的路径和模式标记
 
-    # 确保输出目录存在
-    os.makedirs(output_path, exist_ok=True)
+    传入clean时同步维护一份清理后的路径（只保留非空片段），每个片段只在进入时清理一次，
+    否则清理后的路径为None。产出的两个路径都是共享的可变列表（末尾为当前节点），
+    只在当次迭代内有效，不要保存。模式标记是路径上所有片段的_mode_flags按位或，
+    随栈逐层继承，叶子节点不必再拼接整条路径做子串查找
+    """
+    path = list(path)
+    cleaned = [part for part in map(clean, path) if part] if clean else None
+    modes = 0
+    for key in path:
+        modes |= _mode_flags(key)
+    # 每一层进入前的模式标记，以及是否向cleaned中压入了片段，出栈时据此恢复
+    saved = []
+    stack = [iter(data.items())]
+    while stack:
+        for key, value in stack[-1]:
+            if type(value) is not dict:
+                continue
+            if is_leaf(value):
+                part = clean(key) if clean else None
+                path.append(key)
+                if part:
+                    cleaned.append(part)
+                yield path, cleaned, value, modes | _mode_flags(key)
+                path.pop()
+                if part:
+                    cleaned.pop()
+            elif type(value.get('type')) is str:
+                # 其他类型的令牌节点（及其value/extensions）里不会再有目标节点，不再向下遍历；
+                # 名为type的子分组（值不是字符串）仍然继续向下遍历
+                continue
+            else:
+                # 继续向下遍历
+                part = clean(key) if clean else None
+                path.append(key)
+                if part:
+                    cleaned.append(part)
+                saved.append((modes, bool(part)))
+                modes |= _mode_flags(key)
+                stack.append(iter(value.items()))
+                break
+        else:
+            stack.pop()
+            if stack:
+                path.pop()
+                modes, part_pushed = saved.pop()
+                if part_pushed:
+                    cleaned.pop()
+
+
+def _collect_primitive_color(value: Dict[str, Any], path: List[str], cleaned_path: List[str], modes: int,
+                             colors: List[Tuple[str, str, int]], dimensions: Dict[str, int]) -> None:
+    """处理primitives中的颜色节点，记录名称、颜色值和要写入的模式"""
+    # #RRGGBBAA格式去掉透明度
+    color_value = value['value']
+    if len(color_value) == 9:
+        color_value = color_value[:7]
+    xml_name = format_cleaned_xml_name(cleaned_path)
+
+    # 根据路径上的模式标记判断是否包含light/dark mode
+    if modes & _LIGHT_MODE:
+        colors.append((xml_name, color_value, _LIGHT_MODE))
+    elif modes & _DARK_MODE:
+        colors.append((xml_name, color_value, _DARK_MODE))
+    else:
+        # 如果没有明确指定模式，同时添加到两个集合
+        colors.append((xml_name, color_value, _LIGHT_MODE | _DARK_MODE))
 
-    # 写入文件
-    file_path = os.path.join(output_path, file_name)
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(xml_content)
 
-    print(f"Generated: {file_path}")
+def _collect_spacing_dimension(value: Dict[str, Any], path: List[str], cleaned_path: List[str], modes: int,
+                               colors: List[Tuple[str, str, int]], dimensions: Dict[str, int]) -> None:
+    """处理primitives中的尺寸节点，只收集spacing分组下的尺寸"""
+    if len(path) > 1 and path[0] == 'spacing':
+        dimensions[format_spacing_name(path)] = value['value']
 
 
-def generate_dimens_xml(dimensions: Dict[str, int], output_path: str, file_name: str) -> None:
-    """生成Android dimens.xml文件"""
-    xml_content = '<?xml version="1.0" encoding="utf-8"?>\n'
-    xml_content += '<resources>\n'
+# primitives中按节点type分发的处理函数
+_PRIMITIVE_HANDLERS = {
+    'color': _collect_primitive_color,
+    'dimension': _collect_spacing_dimension,
+}
 
-    # 按名称排序
-    for name in sorted(dimensions.keys()):
-        xml_content += f'    <dimen name="{name}">{dimensions[name]}dp</dimen>\n'
 
-    xml_content += '</resources>'
+def is_primitive_leaf(node: Dict[str, Any]) -> bool:
+    """判断是否为primitives中需要提取的颜色或尺寸节点"""
+    # 分组下可能有名为type的子节点（值是dict），先确认是字符串再查表
+    node_type = node.get('type')
+    return type(node_type) is str and node_type in _PRIMITIVE_HANDLERS and 'value' in node
 
-    # 确保输出目录存在
-    os.makedirs(output_path, exist_ok=True)
 
-    # 写入文件
-    file_path = os.path.join(output_path, file_name)
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(xml_content)
+def traverse_primitives(data: Dict[str, Any], path: List[str],
+                        colors: List[Tuple[str, str, int]],
+                        dimensions: Dict[str, int]) -> None:
+    """一次遍历primitives模块，同时提取颜色和spacing尺寸
 
-    print(f"Generated: {file_path}")
+    颜色按遍历顺序记录为 (名称, 颜色值, 模式标记)，由调用方再拆分成日间和夜间两个集合
+    """
+    handlers = _PRIMITIVE_HANDLERS
+    for current_path, cleaned_path, value, modes in _iter_leaves(data, path, is_primitive_leaf, clean_name_segment):
+        handlers[value['type']](value, current_path, cleaned_path, modes, colors, dimensions)
 
 
-def generate_semantic_dimens_xml(dimensions: Dict[str, int], output_path: str, file_name: str) -> None:
-    """生成Android dimens.xml文件"""
-    xml_content = '<?xml version="1.0" encoding="utf-8"?>\n'
-    xml_content += '<resources>\n'
+# 输出文件的写缓冲区大小
+_WRITE_BUFFER_SIZE = 1 << 20
 
-    # 按名称排序
-    for name in sorted(dimensions.keys()):
-        xml_content += f'    <dimen name="{name}">@dimen/{dimensions[name]}</dimen>\n'
+# resources XML的开头和结尾
+_RESOURCES_HEADER = b'<?xml version="1.0" encoding="utf-8"?>\n<resources>\n'
+_RESOURCES_FOOTER = b'</resources>'
+
+# 本次运行中已确认存在的输出目录
+_ensured_dirs = set()
 
-    xml_content += '</resources>'
 
+def _ensure_dir(path: str) -> None:
+    """确保目录存在，同一目录只调用一次os.makedirs"""
+    if path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
+
+def write_resources_xml(lines: Iterable[str], output_path: str, file_name: str) -> None:
+    """把资源条目写成完整的resources XML"""
     # 确保输出目录存在
-    os.makedirs(output_path, exist_ok=True)
+    _ensure_dir(output_path)
 
     # 写入文件
     file_path = os.path.join(output_path, file_name)
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(xml_content)
+    with open(file_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+        f.write(_RESOURCES_HEADER)
+        f.writelines(map(str.encode, lines))
+        f.write(_RESOURCES_FOOTER)
 
     print(f"Generated: {file_path}")
 
 
-def process_primitives(data: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, str]]:
-    """处理primitives模块，提取颜色"""
-    light_colors = {}
-    dark_colors = {}
+def _color_lines(colors: Dict[str, str], names: Iterable[str]) -> Iterator[str]:
+    """按names的顺序生成color条目，跳过colors中没有的名称"""
+    return (f'    <color name="{name}">{colors[name]}</color>\n' for name in names if name in colors)
+
+
+def generate_android_xml_pair(light_colors: Dict[str, str], dark_colors: Dict[str, str],
+                              output_dir: str, file_name: str) -> None:
+    """生成values和values-night下的同名颜色XML文件，两份文件共用一次排好序的名称列表"""
+    # 日夜间的名称大部分相同，合并后只排序一次
+    names = sorted(light_colors.keys() | dark_colors.keys())
+    write_resources_xml(_color_lines(light_colors, names), os.path.join(output_dir, "values"), file_name)
+    write_resources_xml(_color_lines(dark_colors, names), os.path.join(output_dir, "values-night"), file_name)
+
+
+def generate_dimens_xml(dimensions: Dict[str, int], output_path: str, file_name: str) -> None:
+    """生成Android dimens.xml文件"""
+    # 按名称排序
+    write_resources_xml((f'    <dimen name="{name}">{value}dp</dimen>\n' for name, value in sorted(dimensions.items())),
+                        output_path, file_name)
 
-    print("Extracting primitive colors...")
-    traverse_primitive_colors(data['primitives'], [], light_colors, dark_colors)
 
-    return light_colors, dark_colors
+def generate_semantic_dimens_xml(dimensions: Dict[str, int], output_path: str, file_name: str) -> None:
+    """生成Android dimens.xml文件"""
+    # 按名称排序
+    write_resources_xml((f'    <dimen name="{name}">@dimen/{value}</dimen>\n'
+                         for name, value in sorted(dimensions.items())),
+                        output_path, file_name)
 
 
-def process_spacing_dimensions(data: Dict[str, Any]) -> Dict[str, int]:
-    """处理primitives模块中的spacing尺寸"""
+def process_primitives(data: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, int]]:
+    """处理primitives模块，一次遍历提取颜色和spacing尺寸"""
+    colors = []
     dimensions = {}
 
-    print("Extracting spacing dimensions...")
-    if 'primitives' in data and 'spacing' in data['primitives']:
-        traverse_spacing_dimensions(data['primitives']['spacing'], ['spacing'], dimensions)
-    else:
+    print("Extracting primitive colors and spacing dimensions...")
+    if 'spacing' not in data['primitives']:
         print("Warning: 'spacing' not found in primitives")
+    traverse_primitives(data['primitives'], [], colors, dimensions)
+
+    # 遍历时只记录一次，最后按模式标记拆分；同名颜色仍是后出现的覆盖先出现的
+    light_colors = {name: value for name, value, modes in colors if modes & _LIGHT_MODE}
+    dark_colors = {name: value for name, value, modes in colors if modes & _DARK_MODE}
 
-    return dimensions
+    return light_colors, dark_colors, dimensions
 
 
 def generate_xml_files(light_colors: Dict[str, str], dark_colors: Dict[str, str],
                        output_dir: str) -> None:
     """生成Android XML文件"""
     print("Generating Android XML files...")
-    generate_android_xml(light_colors, os.path.join(output_dir, "values"), "primitive_color.xml")
-    generate_android_xml(dark_colors, os.path.join(output_dir, "values-night"), "primitive_color.xml")
+    generate_android_xml_pair(light_colors, dark_colors, output_dir, "primitive_color.xml")
+
+
+# 解析颜色引用时需要跳过的路径片段
+_SKIP_COLOR_PARTS = frozenset({'colors', 'base'})
 
 
 def resolve_color_reference(reference: str, primitive_color_map: Dict[str, str]) -> str:
@@ -337,17 +414,13 @@ def resolve_color_reference(reference: str, primitive_color_map: Dict[str, str])
         reference = reference[1:-1]
 
     # 去掉light mode或dark mode
-    reference = re.sub(r'\s*\(light mode\)', '', reference)
-    reference = re.sub(r'\s*\(dark mode\)', '', reference)
+    reference = reference.replace(' (light mode)', '').replace(' (dark mode)', '')
 
     # 以点号分割路径
     path_parts = reference.split('.')
 
     # 移除 'colors' 和 'base' 前缀
-    filtered_parts = []
-    for part in path_parts:
-        if part not in ['colors', 'base']:
-            filtered_parts.append(part)
+    filtered_parts = [part for part in path_parts if part not in _SKIP_COLOR_PARTS]
 
     # 如果只剩一个部分，直接使用
     if len(filtered_parts) == 1:
@@ -363,8 +436,31 @@ def resolve_color_reference(reference: str, primitive_color_map: Dict[str, str])
     return None
 
 
+# 当前用于解析引用的primitive color map，供_resolve_color_name的缓存使用
+_primitive_map = None
+
+
+def _bind_primitive_map(primitive_color_map: Dict[str, str]) -> None:
+    """绑定primitive color map，换成另一个map时清空解析缓存"""
+    global _primitive_map
+    if primitive_color_map is not _primitive_map:
+        _primitive_map = primitive_color_map
+        _resolve_color_name.cache_clear()
+
+
 def resolve_color_reference_to_name(reference: str, primitive_color_map: Dict[str, str]) -> str:
-    """解析颜色引用，返回primitive color的名称"""
+    """解析颜色引用，返回primitive color的名称
+
+    同一个primitive常被多个语义颜色引用，结果按引用字符串缓存
+    """
+    _bind_primitive_map(primitive_color_map)
+    return _resolve_color_name(reference)
+
+
+@lru_cache(maxsize=None)
+def _resolve_color_name(reference: str) -> str:
+    """resolve_color_reference_to_name的缓存实现，使用当前绑定的_primitive_map"""
+    primitive_color_map = _primitive_map
     # 去除开头和结尾的花括号
     if reference.startswith('{') and reference.endswith('}'):
         reference = reference[1:-1]
@@ -388,11 +484,14 @@ def resolve_color_reference_to_name(reference: str, primitive_color_map: Dict[st
         return resolve_primitives_reference(reference, primitive_color_map)
 
 
+# 解析primitives引用时需要跳过的路径片段
+_SKIP_PRIMITIVE_PARTS = frozenset({'primitives', 'colors', 'base'})
+
+
 def resolve_primitives_reference(reference: str, primitive_color_map: Dict[str, str]) -> str:
     """解析primitives引用"""
     # 去掉light mode或dark mode
-    reference = re.sub(r'\s*\(light mode\)', '', reference)
-    reference = re.sub(r'\s*\(dark mode\)', '', reference)
+    reference = reference.replace(' (light mode)', '').replace(' (dark mode)', '')
 
     # 以点号分割路径
     path_parts = reference.split('.')
@@ -400,7 +499,7 @@ def resolve_primitives_reference(reference: str, primitive_color_map: Dict[str,
     # 移除 'primitives', 'colors', 'base' 等前缀
     filtered_parts = []
     for part in path_parts:
-        if part not in ['primitives', 'colors', 'base']:
+        if part not in _SKIP_PRIMITIVE_PARTS:
             # 替换空格为下划线
             part = part.replace(' ', '_')
             if part:
@@ -438,8 +537,43 @@ def resolve_primitives_reference(reference: str, primitive_color_map: Dict[str,
     return None
 
 
+def is_reference_node(node: Dict[str, Any]) -> bool:
+    """判断是否为颜色引用节点"""
+    return 'value' in node and isinstance(node['value'], str)
+
+
+# 当前建立了索引的JSON数据，以及其中 '1. color modes' 子树里各节点路径到value的映射
+_color_modes_source = None
+_color_modes_index = {}
+
+
+def _bind_color_modes_index(json) -> None:
+    """为 '1. color modes' 子树建立一次路径元组到value的扁平索引，换成另一份数据时重建"""
+    global _color_modes_source, _color_modes_index
+    if json is _color_modes_source:
+        return
+    index = {}
+    root = json.get('1. color modes')
+    stack = [((), root)] if isinstance(root, dict) else []
+    while stack:
+        key_path, node = stack.pop()
+        if 'value' in node:
+            index[key_path] = node['value']
+        for key, child in node.items():
+            if type(child) is dict:
+                stack.append((key_path + (key,), child))
+    _color_modes_source = json
+    _color_modes_index = index
+
+
 def get_node_value(json, nodeRef):  #
+    _bind_color_modes_index(json)
     paths = nodeRef.split(".")[2:]
+    try:
+        return _color_modes_index[tuple(paths)]
+    except KeyError:
+        pass
+    # 索引中没有的路径按原方式逐层查找，保持原有的报错行为
     v = json.get('1. color modes')
     for path in paths:
         v = v.get(path)
@@ -449,40 +583,34 @@ def get_node_value(json, nodeRef):  #
 def traverse_semantic_colors(full_data: Dict[str, Any], data: Dict[str, Any], path: List[str],
                              light_semantic: Dict[str, str],
                              dark_semantic: Dict[str, str],
-                             primitive_color_map: Dict[str, str]) -> None:
-    """遍历语义颜色节点"""
-    for key, value in data.items():
-        current_path = path + [key]
-
-        if isinstance(value, dict):
-            if 'value' in value and isinstance(value['value'], str):
-                # 这是一个颜色引用节点
-                reference = value['value']
-                print(f"--{isinstance(reference, str)}")
-                if reference.startswith('{1. color modes'):  # 说明引用的是color modes下的节点，找到这个节点读取其value属性。
-                    reference = get_node_value(full_data, reference[1:-1])
-                primitive_color_name = resolve_color_reference_to_name(reference, primitive_color_map)
-
-                if primitive_color_name:
-                    xml_name = format_xml_name(current_path)
-                    color_reference = f"@color/{primitive_color_name}"
-
-                    # 根据路径判断是light mode还是dark mode
-                    path_str = ' '.join(current_path).lower()
-
-                    if 'light mode' in path_str:
-                        light_semantic[xml_name] = color_reference
-                    elif 'dark mode' in path_str:
-                        dark_semantic[xml_name] = color_reference
-                    else:
-                        print()
-                        # 如果没有明确指定模式，同时添加到两个集合
-                        # light_semantic[xml_name] = color_reference
-                        # dark_semantic[xml_name] = color_reference
-            else:
-                # 继续递归
-                traverse_semantic_colors(full_data, value, current_path, light_semantic,
-                                         dark_semantic, primitive_color_map)
+                             primitive_color_map: Dict[str, str],
+                             color_ref_cache: Optional[Dict[str, str]] = None) -> None:
+    """遍历语义颜色节点
+
+    color_ref_cache是primitive名称到 "@color/名称" 的映射，同一个引用字符串只生成一次；
+    没有传入或其中缺少的名称会在遍历时补上
+    """
+    if color_ref_cache is None:
+        color_ref_cache = {}
+    for current_path, cleaned_path, value, modes in _iter_leaves(data, path, is_reference_node, clean_name_segment):
+        # 这是一个颜色引用节点
+        reference = value['value']
+        if reference.startswith('{1. color modes'):  # 说明引用的是color modes下的节点，找到这个节点读取其value属性。
+            reference = get_node_value(full_data, reference[1:-1])
+        primitive_color_name = resolve_color_reference_to_name(reference, primitive_color_map)
+
+        if primitive_color_name:
+            xml_name = format_cleaned_xml_name(cleaned_path)
+            color_reference = color_ref_cache.get(primitive_color_name)
+            if color_reference is None:
+                color_reference = color_ref_cache[primitive_color_name] = f"@color/{primitive_color_name}"
+
+            # 根据路径上的模式标记判断是light mode还是dark mode
+            if modes & _LIGHT_MODE:
+                light_semantic[xml_name] = color_reference
+            elif modes & _DARK_MODE:
+                dark_semantic[xml_name] = color_reference
+            # 没有明确指定模式的语义颜色不添加到任何集合
 
 
 def process_color_modes(data: Dict[str, Any], primitive_color_map: Dict[str, str]) -> Tuple[
@@ -503,8 +631,10 @@ def process_color_modes(data: Dict[str, Any], primitive_color_map: Dict[str, str
         return light_semantic, dark_semantic
 
     print("Processing semantic colors...")
+    # primitive名称有限，预先生成所有 "@color/名称" 引用字符串
+    color_ref_cache = {name: f"@color/{name}" for name in primitive_color_map}
     traverse_semantic_colors(data, data[color_modes_key], [], light_semantic,
-                             dark_semantic, primitive_color_map)
+                             dark_semantic, primitive_color_map, color_ref_cache)
 
     return light_semantic, dark_semantic
 
@@ -514,8 +644,7 @@ def generate_semantic_xml_files(light_semantic: Dict[str, str],
                                 output_dir: str) -> None:
     """生成语义颜色XML文件"""
     print("Generating semantic color XML files...")
-    generate_android_xml(light_semantic, os.path.join(output_dir, "values"), "semantic_color.xml")
-    generate_android_xml(dark_semantic, os.path.join(output_dir, "values-night"), "semantic_color.xml")
+    generate_android_xml_pair(light_semantic, dark_semantic, output_dir, "semantic_color.xml")
 
 
 def print_summary(light_colors: Dict[str, str], dark_colors: Dict[str, str],
@@ -564,19 +693,16 @@ def main():
         print("Error: 'primitives' module not found in JSON")
         return
 
-    # 处理primitives模块
-    light_colors, dark_colors = process_primitives(data)
+    # 处理primitives模块（颜色和spacing尺寸）
+    light_colors, dark_colors, dimensions = process_primitives(data)
 
-    # 创建primitive color map，合并light和dark模式的所有颜色
-    primitive_color_map = {}
-    primitive_color_map.update(light_colors)
-    primitive_color_map.update(dark_colors)
+    # 创建primitive color map，合并light和dark模式的所有颜色（同名时dark优先），不复制数据
+    primitive_color_map = ChainMap(dark_colors, light_colors)
 
     # 处理color modes模块（语义颜色）
     light_semantic, dark_semantic = process_color_modes(data, primitive_color_map)
 
-    # 处理spacing尺寸
-    dimensions = process_spacing_dimensions(data)
+    # 处理语义spacing尺寸
     semantic_dimensions = process_semantic_spacing(data)
     # 处理渐变
     gradients = process_gradients(data)
@@ -612,12 +738,12 @@ def format_gradient_name(parent_name: str, node_name: str) -> str:
 
     # 其他情况直接拼接
     # 清理名称，移除特殊字符
-    parent_clean = re.sub(r'[^a-zA-Z0-9]', '_', parent_name)
-    node_clean = re.sub(r'[^a-zA-Z0-9]', '_', node_name)
+    parent_clean = parent_name.translate(_XLATE)
+    node_clean = node_name.translate(_XLATE)
 
-    # 移除连续的下划线
-    parent_clean = re.sub(r'_+', '_', parent_clean).strip('_')
-    node_clean = re.sub(r'_+', '_', node_clean).strip('_')
+    # 移除连续的下划线以及开头和结尾的下划线
+    parent_clean = '_'.join(filter(None, parent_clean.split('_')))
+    node_clean = '_'.join(filter(None, node_clean.split('_')))
 
     return f"{parent_clean}_{node_clean}"
 
@@ -651,39 +777,33 @@ def generate_android_gradient_xml(gradient_name: str, rotation: float, start_col
 
 def traverse_gradient_nodes(data: Dict[str, Any], path: List[str], gradients: Dict[str, Dict[str, Any]]) -> None:
     """遍历渐变节点"""
-    for key, value in data.items():
-        current_path = path + [key]
-
-        if isinstance(value, dict):
-            if is_gradient_node(value):
-                # 这是一个渐变节点
-                gradient_value = value['value']
-                rotation = gradient_value.get('rotation', 0)
-                stops = gradient_value.get('stops', [])
-
-                # 确保有两个停止点
-                if len(stops) >= 2:
-                    start_color = stops[0]['color']
-                    end_color = stops[1]['color']
-
-                    # 生成XML名称
-                    if len(current_path) >= 2:
-                        parent_name = current_path[-2]  # 父节点名
-                        node_name = current_path[-1]  # 当前节点名
-                        xml_name = format_gradient_name(parent_name, node_name)
-                    else:
-                        xml_name = format_gradient_name('gradient', current_path[-1])
-
-                    gradients[xml_name] = {
-                        'rotation': rotation,
-                        'start_color': start_color,
-                        'end_color': end_color
-                    }
-
-                    print(f"Found gradient: {xml_name} - {start_color} -> {end_color} ({rotation}°)")
+    for current_path, _, value, _ in _iter_leaves(data, path, is_gradient_node):
+        # 这是一个渐变节点
+        gradient_value = value['value']
+        rotation = gradient_value.get('rotation', 0)
+        stops = gradient_value.get('stops', [])
+
+        # 确保有两个停止点
+        if len(stops) >= 2:
+            start_color = stops[0]['color']
+            end_color = stops[1]['color']
+
+            # 生成XML名称
+            if len(current_path) >= 2:
+                parent_name = current_path[-2]  # 父节点名
+                node_name = current_path[-1]  # 当前节点名
+                xml_name = format_gradient_name(parent_name, node_name)
             else:
-                # 继续递归
-                traverse_gradient_nodes(value, current_path, gradients)
+                xml_name = format_gradient_name('gradient', current_path[-1])
+
+            gradients[xml_name] = {
+                'rotation': rotation,
+                'start_color': start_color,
+                'end_color': end_color
+            }
+
+            if VERBOSE:
+                print(f"Found gradient: {xml_name} - {start_color} -> {end_color} ({rotation}°)")
 
 
 def process_gradients(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
@@ -703,10 +823,11 @@ def process_gradients(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
 def generate_gradient_xml_files(gradients: Dict[str, Dict[str, Any]], output_dir: str) -> None:
     """生成渐变XML文件"""
     gradient_dir = os.path.join(output_dir, "gradients")
-    os.makedirs(gradient_dir, exist_ok=True)
+    _ensure_dir(gradient_dir)
 
     print(f"Generating gradient XML files in {gradient_dir}...")
 
+    written = []
     for gradient_name, gradient_data in gradients.items():
         xml_content = generate_android_gradient_xml(
             gradient_name,
@@ -716,10 +837,11 @@ def generate_gradient_xml_files(gradients: Dict[str, Dict[str, Any]], output_dir
         )
 
         file_path = os.path.join(gradient_dir, f"{gradient_name}.xml")
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(xml_content)
+        with open(file_path, 'wb') as f:
+            f.write(xml_content.encode('utf-8'))
+        written.append(file_path)
 
-        print(f"Generated: {file_path}")
+    print(f"Generated {len(written)} gradient files in {gradient_dir}")
 
 
 if __name__ == "__main__":